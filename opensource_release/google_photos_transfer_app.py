@@ -4,13 +4,23 @@
 
 import os
 import json
+import atexit
+import logging
+import logging.handlers
+import queue
+import datetime
+import concurrent.futures
 import sqlite3
+import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
 
 # Google API imports
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2.credentials import Credentials
+from requests.adapters import HTTPAdapter
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
@@ -29,44 +39,102 @@ SCOPES = [
 # The user must place this file in the project root.
 CLIENT_SECRETS_FILE = "client_secret.json"
 
+# Cached OAuth user credentials, created on first login
+TOKEN_FILE = "token.json"
+
+# Refresh the access token when it is this close to expiring. google-auth
+# already treats a token as expired ~4 minutes early and then refreshes it
+# inside each request, so the margin must also cover a full batch of uploads.
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=15)
+
+# Uploadable file extensions and the MIME type reported for each
+MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".webp": "image/webp",
+    ".mp4": "video/mp4",
+}
+
 # File that stores detailed transfer logs
 TRANSFER_LOG_FILE = "transfer_log.txt"
 
 # SQLite database for tracking transfer state
 DB_FILE = "transfer_state.db"
 
+# Number of files uploaded concurrently within a batch
+UPLOAD_WORKERS = 8
+
+# Seconds to wait on the upload endpoint before giving up on a file
+UPLOAD_TIMEOUT = 120
+
 # ---------------------------------------------------------------------------
 # Helper functions for Logging
 # ---------------------------------------------------------------------------
 
+# Log file writes are handed to a background listener thread through a queue,
+# so callers in the upload loop never block on file I/O. The file is opened
+# once, on the first message.
+_log_queue = queue.Queue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.FileHandler(TRANSFER_LOG_FILE, encoding="utf-8", delay=True))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_file_logger = logging.getLogger("google_photos_transfer")
+_file_logger.setLevel(logging.INFO)
+_file_logger.propagate = False
+_file_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+
 def log_message(message: str):
     """Log a message with a timestamp to both console and log file."""
-    import datetime
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    formatted_msg = f"[{timestamp}] {message}"
+    formatted_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}"
     print(formatted_msg)
-    with open(TRANSFER_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(formatted_msg + "\n")
+    _file_logger.info(formatted_msg)
 
 # ---------------------------------------------------------------------------
 # Database Management
 # ---------------------------------------------------------------------------
 
+# Paths are stored in posix form. Building a Path just to call as_posix() is
+# comparatively expensive for per-file lookups, so do the separator swap directly.
+if os.sep == "\\":
+    def _to_posix(path: str) -> str:
+        return path.replace("\\", "/")
+else:
+    def _to_posix(path: str) -> str:
+        return path
+
+
 class TransferDB:
     def __init__(self, db_path=DB_FILE):
         self.db_path = db_path
+        # A single connection shared by all calls; autocommit mode, with explicit
+        # transactions only where several writes are grouped together.
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
         self._init_db()
 
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        with self.lock:
+            # WAL lets readers run alongside the writer and avoids the rollback
+            # journal fsyncs on every commit during upload bursts.
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-20000")
+            self.conn.execute("PRAGMA busy_timeout=5000")
+            self.conn.execute("""
                 CREATE TABLE IF NOT EXISTS folders (
                     path TEXT PRIMARY KEY,
                     album_id TEXT,
                     status TEXT DEFAULT 'pending'
                 )
             """)
-            conn.execute("""
+            self.conn.execute("""
                 CREATE TABLE IF NOT EXISTS files (
                     path TEXT PRIMARY KEY,
                     folder_path TEXT,
@@ -74,55 +142,134 @@ class TransferDB:
                     FOREIGN KEY(folder_path) REFERENCES folders(path)
                 )
             """)
-            conn.commit()
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_files_folder_status ON files(folder_path, status)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_folders_status ON folders(status)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
 
     def get_folder_resumption_data(self, folder_path: str):
         """Returns (album_id, status) for a folder."""
-        folder_path = Path(folder_path).as_posix()
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT album_id, status FROM folders WHERE path = ?", (folder_path,))
+        folder_path = _to_posix(folder_path)
+        with self.lock:
+            cursor = self.conn.execute("SELECT album_id, status FROM folders WHERE path = ?", (folder_path,))
             return cursor.fetchone()
 
+    def get_all_folders(self) -> dict:
+        """Returns {path: (album_id, status)} for every known folder."""
+        with self.lock:
+            cursor = self.conn.execute("SELECT path, album_id, status FROM folders")
+            return {path: (album_id, status) for path, album_id, status in cursor}
+
     def set_folder_album(self, folder_path: str, album_id: str):
-        folder_path = Path(folder_path).as_posix()
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        folder_path = _to_posix(folder_path)
+        with self.lock:
+            self.conn.execute("""
                 INSERT INTO folders (path, album_id) VALUES (?, ?)
                 ON CONFLICT(path) DO UPDATE SET album_id = excluded.album_id
             """, (folder_path, album_id))
-            conn.commit()
 
     def set_folder_status(self, folder_path: str, status: str):
-        folder_path = Path(folder_path).as_posix()
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("UPDATE folders SET status = ? WHERE path = ?", (status, folder_path))
-            conn.commit()
+        folder_path = _to_posix(folder_path)
+        with self.lock:
+            self.conn.execute("UPDATE folders SET status = ? WHERE path = ?", (status, folder_path))
+
+    def bulk_set_folder_status(self, pairs: list):
+        """Upsert (folder_path, status) pairs in a single transaction."""
+        rows = [(_to_posix(path), status) for path, status in pairs]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("""
+                    INSERT INTO folders (path, status) VALUES (?, ?)
+                    ON CONFLICT(path) DO UPDATE SET status = excluded.status
+                """, rows)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
 
     def is_file_uploaded(self, file_path: str) -> bool:
-        file_path = Path(file_path).as_posix()
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT 1 FROM files WHERE path = ? AND status = 'uploaded'", (file_path,))
+        file_path = _to_posix(file_path)
+        with self.lock:
+            cursor = self.conn.execute("SELECT 1 FROM files WHERE path = ? AND status = 'uploaded'", (file_path,))
             return cursor.fetchone() is not None
 
+    def filter_uploaded(self, file_paths: list) -> set:
+        """Returns the subset of file_paths already marked as uploaded."""
+        file_paths = [_to_posix(p) for p in file_paths]
+        uploaded = set()
+        with self.lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(file_paths), 500):
+                chunk = file_paths[i : i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = self.conn.execute(
+                    f"SELECT path FROM files WHERE status = 'uploaded' AND path IN ({placeholders})", chunk)
+                uploaded.update(row[0] for row in cursor)
+        return uploaded
+
     def mark_file_uploaded(self, file_path: str, folder_path: str):
-        file_path = Path(file_path).as_posix()
-        folder_path = Path(folder_path).as_posix()
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        file_path = _to_posix(file_path)
+        folder_path = _to_posix(folder_path)
+        with self.lock:
+            self.conn.execute("""
                 INSERT INTO files (path, folder_path, status) VALUES (?, ?, 'uploaded')
                 ON CONFLICT(path) DO UPDATE SET status = 'uploaded'
             """, (file_path, folder_path))
-            conn.commit()
+
+    def mark_files_uploaded(self, file_paths: list, folder_path: str):
+        """Mark several files as uploaded in a single transaction."""
+        folder_path = _to_posix(folder_path)
+        rows = [(_to_posix(p), folder_path) for p in file_paths]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("""
+                    INSERT INTO files (path, folder_path, status) VALUES (?, ?, 'uploaded')
+                    ON CONFLICT(path) DO UPDATE SET status = 'uploaded'
+                """, rows)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
 
 # ---------------------------------------------------------------------------
 # Google API imports (continued)
 # ---------------------------------------------------------------------------
 
+# Credentials and service are cached so repeated transfers reuse them
+_cached_creds = None
+_cached_service = None
+
+
+def refresh_credentials(creds, margin: datetime.timedelta = TOKEN_REFRESH_MARGIN):
+    """Refresh the access token if it expires within `margin`.
+    The refreshed credentials are written back to the token file.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    if creds.valid and (creds.expiry is None or creds.expiry - now > margin):
+        return
+    creds.refresh(Request())
+    Path(TOKEN_FILE).write_text(creds.to_json())
+
+
 def authenticate() -> any:
     """Authenticate the user and return a Google Photos service object.
     The function uses the OAuth flow and stores the credentials in a token.json file.
+    The service is built once and reused on later calls while its credentials can
+    still be refreshed.
     """
-    token_path = Path("token.json")
+    global _cached_creds, _cached_service
+    if _cached_service is not None:
+        try:
+            refresh_credentials(_cached_creds)
+            return _cached_service
+        except Exception as e:
+            log_message(f"Cached credentials could not be refreshed, re-authenticating: {e}")
+
+    token_path = Path(TOKEN_FILE)
     creds = None
     if token_path.exists():
         creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
@@ -136,6 +283,8 @@ def authenticate() -> any:
         # Save the credentials for the next run
         token_path.write_text(creds.to_json())
     service = build("photoslibrary", "v1", credentials=creds, static_discovery=False)
+    _cached_creds = creds
+    _cached_service = service
     return service
 
 
@@ -148,35 +297,38 @@ def create_album(service, title: str) -> str:
     return response.get("id")
 
 
-def upload_bytes(service, file_path: str) -> str:
+def create_upload_session(credentials) -> AuthorizedSession:
+    """Create the authorized HTTP session shared by all upload workers.
+    Its connection pool keeps keep-alive connections to the upload endpoint,
+    so each file does not pay for a new TLS handshake.
+    """
+    # Expired tokens are still refreshed before each request; retrying on a
+    # 401 is disabled because a streamed file body cannot be replayed.
+    session = AuthorizedSession(credentials, refresh_status_codes=())
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    return session
+
+
+def upload_bytes(session, file_path: str) -> str:
     """Upload raw bytes of a file to Google Photos.
     Returns the upload token (valid for 1 day).
     """
     file_name = os.path.basename(file_path)
     # Determine MIME type – simple heuristic based on extension
-    mime_type = "image/jpeg"
-    if file_path.lower().endswith('.png'):
-        mime_type = "image/png"
-    elif file_path.lower().endswith('.gif'):
-        mime_type = "image/gif"
-    elif file_path.lower().endswith('.mp4'):
-        mime_type = "video/mp4"
-    # Read file bytes
-    with open(file_path, "rb") as f:
-        data = f.read()
+    mime_type = MIME_TYPES.get(os.path.splitext(file_name)[1].lower(), "application/octet-stream")
     upload_url = "https://photoslibrary.googleapis.com/v1/uploads"
     headers = {
-        "Authorization": f"Bearer {service._http.credentials.token}",
         "Content-type": "application/octet-stream",
+        "X-Goog-Upload-Content-Type": mime_type,
         "X-Goog-Upload-File-Name": file_name,
         "X-Goog-Upload-Protocol": "raw",
     }
-    # Use the underlying Http request object from the service
-    http = service._http
-    response, content = http.request(upload_url, method="POST", body=data, headers=headers)
-    if response.status != 200:
-        raise RuntimeError(f"Upload failed for {file_path}: {content}")
-    upload_token = content.decode("utf-8")
+    # Stream the file from disk rather than loading it into memory
+    with open(file_path, "rb") as f:
+        response = session.post(upload_url, headers=headers, data=f, timeout=UPLOAD_TIMEOUT)
+    if response.status_code != 200:
+        raise RuntimeError(f"Upload failed for {file_path} ({response.status_code}): {response.text}")
+    upload_token = response.text
     return upload_token
 
 
@@ -206,6 +358,31 @@ def add_media_items_to_album(service, album_id: str, media_item_ids: list):
     body = {"mediaItemIds": media_item_ids}
     service.albums().batchAddMediaItems(albumId=album_id, body=body).execute()
 
+# ---------------------------------------------------------------------------
+# File scanning
+# ---------------------------------------------------------------------------
+
+def find_media_files(folder_path: str) -> list:
+    """Recursively collect files under folder_path with an uploadable extension.
+    Uses os.scandir so file/directory checks come from the cached directory
+    entry instead of a separate stat() per file. Like os.walk, symlinked
+    directories are not descended into and unreadable directories are skipped.
+    """
+    media_files = []
+    pending = [folder_path]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in MIME_TYPES:
+                        media_files.append(entry.path)
+        except OSError:
+            continue
+    return media_files
+
 # ---------------------------------------------------------------------------
 # Migration helper
 # ---------------------------------------------------------------------------
@@ -217,9 +394,10 @@ def migrate_json_to_db(db: TransferDB):
         try:
             with open(json_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                for folder_path, status in data.items():
-                    if status == "processed":
-                        db.set_folder_status(folder_path, "processed")
+            db.bulk_set_folder_status([
+                (Path(folder_path).as_posix(), "processed")
+                for folder_path, status in data.items() if status == "processed"
+            ])
             # Rename legacy file to avoid re-migration
             json_path.rename("processed_folders.json.bak")
             log_message("Migration complete. Legacy file renamed to .bak")
@@ -235,11 +413,33 @@ class TransferApp(tk.Tk):
         self.title("Google Photos Transfer")
         self.geometry("800x600")
         self.service = None
+        self.credentials = None
+        self.http_session = None
         self.db = TransferDB()
         migrate_json_to_db(self.db)
         self.selected_folders = []
+        # Mirrors selected_folders for O(1) duplicate checks
+        self.selected_folders_set = set()
+        self.folder_map = {}
+        self.transfer_thread = None
+        self.stop_event = threading.Event()
+        self.closing = False
         self.source_parent = ""
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        if self.transfer_thread and self.transfer_thread.is_alive():
+            if not messagebox.askyesno("Quit", "A transfer is running. Stop it after the current batch and quit?"):
+                return
+        # The worker may have finished while the dialog was open
+        if self.transfer_thread and self.transfer_thread.is_alive():
+            # _on_transfer_finished shuts down once the worker has stopped
+            self.closing = True
+            self.stop_transfer()
+            return
+        self.db.close()
+        self.destroy()
 
     def create_widgets(self):
         # Configure style
@@ -322,6 +522,7 @@ class TransferApp(tk.Tk):
         self.progress_bar.pack(side="left", fill="x", expand=True, padx=10)
         
         ttk.Button(footer, text="Start Transfer", command=self.start_transfer).pack(side="right")
+        ttk.Button(footer, text="Stop", command=self.stop_transfer).pack(side="right", padx=(0, 5))
 
     def select_source(self):
         folder = filedialog.askdirectory()
@@ -340,15 +541,17 @@ class TransferApp(tk.Tk):
 
         # Scan subdirectories
         try:
-            subdirs = [d for d in os.listdir(self.source_parent) if os.path.isdir(os.path.join(self.source_parent, d))]
-            subdirs.sort()
+            with os.scandir(self.source_parent) as it:
+                subdirs = sorted(entry.name for entry in it if entry.is_dir())
+            folder_map = self.db.get_all_folders()
+            self.folder_map = folder_map
             
             for d in subdirs:
                 # Normalize path to posix style for consistent matching
                 full_path = Path(self.source_parent) / d
                 full_path_str = full_path.as_posix()
                 
-                db_data = self.db.get_folder_resumption_data(full_path_str)
+                db_data = folder_map.get(full_path_str)
                 status = db_data[1] if db_data else "Ready"
                 # If DB has a record, it might be 'pending' or 'processed'
                 display_status = "Uploaded" if status == "processed" else "Ready"
@@ -396,7 +599,8 @@ class TransferApp(tk.Tk):
                 full_path = Path(self.source_parent) / folder_name
                 full_path_str = full_path.as_posix()
                 
-                if full_path_str not in self.selected_folders:
+                if full_path_str not in self.selected_folders_set:
+                    self.selected_folders_set.add(full_path_str)
                     self.selected_folders.append(full_path_str)
                     self.queue_listbox.insert(tk.END, folder_name)
                     added_count += 1
@@ -410,55 +614,112 @@ class TransferApp(tk.Tk):
             messagebox.showinfo("Info", "No new folders were selected to add.")
 
     def remove_from_queue(self):
+        if self.transfer_thread and self.transfer_thread.is_alive():
+            messagebox.showinfo("Info", "The queue cannot be edited while a transfer is running.")
+            return
         selected = list(self.queue_listbox.curselection())
         for idx in reversed(selected):
             # We need to map back to the path. Since queue_listbox only stores names, 
             # we should maintain a synchronized list or store paths directly.
             # Let's use self.selected_folders as the source of truth.
             folder_path = self.selected_folders[idx]
+            self.selected_folders_set.discard(folder_path)
             self.selected_folders.pop(idx)
             self.queue_listbox.delete(idx)
 
     def start_transfer(self):
+        if self.transfer_thread and self.transfer_thread.is_alive():
+            messagebox.showinfo("Info", "A transfer is already running.")
+            return
         if not self.selected_folders:
             messagebox.showwarning("Warning", "No folders selected.")
             return
         try:
             self.service = authenticate()
+            self.credentials = self.service._http.credentials
+            if self.http_session is None or self.http_session.credentials is not self.credentials:
+                self.http_session = create_upload_session(self.credentials)
         except Exception as e:
             messagebox.showerror("Error", f"Authentication failed: {e}")
             return
         
-        total = len(self.selected_folders)
-        for i, folder in enumerate(list(self.selected_folders)):
-            success = self.process_folder(folder)
-            
-            # Update progress
-            self.progress_var.set(((i + 1) / total) * 100)
-            self.update_idletasks()
-            
-            if success:
-                # Remove from queue only if truly successful
-                self.selected_folders.pop(0)
-                self.queue_listbox.delete(0)
-            else:
-                log_message(f"Stopping transfer loop due to error in folder: {folder}")
-                messagebox.showwarning("Transfer Paused", 
-                    f"The transfer was paused due to an error (likely API quota or connection issue).\n\n"
-                    "Progress has been saved. You can try resuming the remaining folders later.")
-                break
-            
+        self.stop_event.clear()
+        self.closing = False
+        self.transfer_thread = threading.Thread(
+            target=self._run_transfer, args=(list(self.selected_folders), self.folder_map), daemon=True)
+        self.transfer_thread.start()
+
+    def stop_transfer(self):
+        if self.transfer_thread and self.transfer_thread.is_alive():
+            self.stop_event.set()
+            log_message("Stop requested. The transfer will halt after the current batch.")
+
+    def _run_transfer(self, folders: list, folder_map: dict):
+        """Worker thread body. GUI updates are marshalled back to Tk via after()."""
+        total = len(folders)
+        paused = False
+        try:
+            for i, folder in enumerate(folders):
+                if self.stop_event.is_set():
+                    break
+                success = self.process_folder(folder, folder_map)
+
+                # Update progress
+                self.after(0, self.progress_var.set, ((i + 1) / total) * 100)
+
+                if success:
+                    # Remove from queue only if truly successful
+                    self.after(0, self._dequeue_first)
+                else:
+                    if not self.stop_event.is_set():
+                        log_message(f"Stopping transfer loop due to error in folder: {folder}")
+                        paused = True
+                    break
+        except Exception as e:
+            log_message(f"Error: Transfer aborted by unexpected error: {e}")
+            if not self.stop_event.is_set():
+                paused = True
+        finally:
+            self.after(0, self._on_transfer_finished, paused)
+
+    def _dequeue_first(self):
+        self.selected_folders_set.discard(self.selected_folders.pop(0))
+        self.queue_listbox.delete(0)
+
+    def _on_transfer_finished(self, paused: bool):
+        if self.closing:
+            self.db.close()
+            self.destroy()
+            return
+
+        if paused:
+            messagebox.showwarning("Transfer Paused", 
+                f"The transfer was paused due to an error (likely API quota or connection issue).\n\n"
+                "Progress has been saved. You can try resuming the remaining folders later.")
+
         # Refresh checklist to show new statuses
         self.refresh_folder_list()
         self.progress_var.set(0)
-        
-        messagebox.showinfo("Done", "Processing complete. Please check the log for details.")
 
-    def process_folder(self, folder_path: str) -> bool:
-        """Process a folder and return True if successful, False if a fatal error occurred."""
+        if self.stop_event.is_set():
+            messagebox.showinfo("Stopped", "Transfer stopped. Progress has been saved.")
+        else:
+            messagebox.showinfo("Done", "Processing complete. Please check the log for details.")
+
+    def process_folder(self, folder_path: str, folder_map: dict = None) -> bool:
+        """Process a folder and return True if successful, False if a fatal error occurred.
+        folder_map is the {path: (album_id, status)} snapshot from refresh_folder_list;
+        a folder it already lists as processed is skipped without touching the DB.
+        """
         # Ensure path is posix normalized
         folder_path = Path(folder_path).as_posix()
         folder_name = os.path.basename(folder_path)
+
+        # A folder never leaves the processed state, so the cached status is safe to trust
+        cached = folder_map.get(folder_path) if folder_map else None
+        if cached and cached[1] == "processed":
+            log_message(f"Skipping already processed folder: {folder_path}")
+            return True
         
         # Check database for existing status
         resumption_data = self.db.get_folder_resumption_data(folder_path)
@@ -491,22 +752,17 @@ class TransferApp(tk.Tk):
         else:
             log_message(f"Folder '{folder_name}' will be uploaded to library without a dedicated album.")
 
-        # Gather image files
-        image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
-        all_files = []
-        for root, _, files in os.walk(folder_path):
-            for f in files:
-                ext = os.path.splitext(f)[1].lower()
-                if ext in image_extensions:
-                    all_files.append(os.path.join(root, f))
+        # Gather media files
+        all_files = find_media_files(folder_path)
         
         if not all_files:
-            log_message(f"No image files found in {folder_path}")
+            log_message(f"No media files found in {folder_path}")
             self.db.set_folder_status(folder_path, "processed")
             return True
             
         # Filter out already uploaded files
-        files_to_upload = [f for f in all_files if not self.db.is_file_uploaded(f)]
+        uploaded = self.db.filter_uploaded(all_files)
+        files_to_upload = [f for f in all_files if _to_posix(f) not in uploaded]
         skipped_count = len(all_files) - len(files_to_upload)
         
         if skipped_count > 0:
@@ -519,43 +775,100 @@ class TransferApp(tk.Tk):
 
         log_message(f"Found {len(files_to_upload)} new files to upload.")
 
-        # Upload files in batches
-        BATCH_SIZE = 10 
-        for i in range(0, len(files_to_upload), BATCH_SIZE):
-            batch = files_to_upload[i : i + BATCH_SIZE]
-            upload_tokens = []
-            current_batch_paths = []
-            
-            for file_path in batch:
-                try:
-                    token = upload_bytes(self.service, file_path)
-                    upload_tokens.append(token)
-                    current_batch_paths.append(file_path)
-                    log_message(f"Successfully uploaded: {file_path}")
-                except Exception as e:
-                    error_msg = str(e)
-                    log_message(f"Failed to upload {file_path}: {error_msg}")
-                    # If quota error, stop immediately
-                    if "quota" in error_msg.lower() or "429" in error_msg:
+        # Upload files in batches. Finished batches are handed to a committer
+        # thread, so each batchCreate call overlaps with the next batch's uploads.
+        BATCH_SIZE = 10
+        commit_queue = queue.Queue(maxsize=2)
+        commit_failed = threading.Event()
+        committer = threading.Thread(
+            target=self._commit_batches,
+            args=(commit_queue, commit_failed, folder_path, album_id),
+            daemon=True)
+        committer.start()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(BATCH_SIZE, UPLOAD_WORKERS)) as executor:
+                for i in range(0, len(files_to_upload), BATCH_SIZE):
+                    if self.stop_event.is_set():
+                        log_message(f"Transfer stopped while processing folder: {folder_path}")
                         return False
-                    # Otherwise continue to next file in batch
-            
-            if upload_tokens:
-                try:
-                    batch_create_media_items(self.service, upload_tokens, album_id=album_id)
-                    for path in current_batch_paths:
-                        self.db.mark_file_uploaded(path, folder_path)
-                except Exception as e:
-                    error_msg = str(e)
-                    log_message(f"Error: Failed to create media items for batch in '{folder_name}': {error_msg}")
-                    if "quota" in error_msg.lower() or "429" in error_msg:
+                    if commit_failed.is_set():
                         return False
-        
+                    batch = files_to_upload[i : i + BATCH_SIZE]
+
+                    # Refresh once per batch, well before expiry, so upload workers
+                    # never find the token expired and refresh it concurrently
+                    try:
+                        refresh_credentials(self.credentials)
+                    except Exception as e:
+                        log_message(f"Error: Failed to refresh credentials: {e}")
+                        return False
+
+                    upload_tokens = []
+                    current_batch_paths = []
+                    quota_exceeded = False
+
+                    futures = {executor.submit(upload_bytes, self.http_session, fp): fp for fp in batch}
+                    for future in concurrent.futures.as_completed(futures):
+                        file_path = futures[future]
+                        if future.cancelled():
+                            # Never attempted because of an earlier quota error
+                            continue
+                        try:
+                            token = future.result()
+                            upload_tokens.append(token)
+                            current_batch_paths.append(file_path)
+                            log_message(f"Successfully uploaded: {file_path}")
+                        except Exception as e:
+                            error_msg = str(e)
+                            log_message(f"Failed to upload {file_path}: {error_msg}")
+                            # If quota error, stop queuing further uploads
+                            if "quota" in error_msg.lower() or "429" in error_msg:
+                                quota_exceeded = True
+                                for pending in futures:
+                                    pending.cancel()
+                            # Otherwise continue with the rest of the batch
+
+                    if quota_exceeded:
+                        return False
+
+                    if upload_tokens:
+                        commit_queue.put((upload_tokens, current_batch_paths))
+        finally:
+            # Let the committer finish batches that were already uploaded
+            commit_queue.put(None)
+            committer.join()
+
+        if commit_failed.is_set():
+            return False
+
         # Mark folder as processed only if we reached the end
         self.db.set_folder_status(folder_path, "processed")
         log_message(f"Completed processing folder: {folder_path}")
         return True
 
+    def _commit_batches(self, commit_queue: queue.Queue, commit_failed: threading.Event,
+                        folder_path: str, album_id: str):
+        """Committer thread: create media items for uploaded batches until a None sentinel.
+        Sets commit_failed on a quota error; later batches are then dropped and
+        their files stay unmarked, so they are uploaded again on the next run.
+        """
+        folder_name = os.path.basename(folder_path)
+        while True:
+            item = commit_queue.get()
+            if item is None:
+                return
+            if commit_failed.is_set():
+                continue
+            upload_tokens, batch_paths = item
+            try:
+                batch_create_media_items(self.service, upload_tokens, album_id=album_id)
+                self.db.mark_files_uploaded(batch_paths, folder_path)
+            except Exception as e:
+                error_msg = str(e)
+                log_message(f"Error: Failed to create media items for batch in '{folder_name}': {error_msg}")
+                if "quota" in error_msg.lower() or "429" in error_msg:
+                    commit_failed.set()
+
 if __name__ == "__main__":
     app = TransferApp()
     app.mainloop()